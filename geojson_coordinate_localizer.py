@@ -1,8 +1,79 @@
+import concurrent.futures
+import itertools
 import json
+import operator
+import os
+import warnings
+from typing import Callable
+
+import numpy
+
+try:
+    import shapely
+except ImportError:
+    shapely = None
+
+try:
+    import ijson
+except ImportError:
+    ijson = None
+
+try:
+    import numba
+except ImportError:
+    numba = None
+
+try:
+    import orjson
+except ImportError:
+    orjson = None
+
+try:
+    import geopandas
+    import pyogrio
+except ImportError:
+    geopandas = None
+    pyogrio = None
+
+# Below this many features the process pool startup costs more than it saves
+PARALLEL_MIN_FEATURES = 10000
 
 #########################
 # Functions and classes #
 #########################
+
+# One specialized kernel per operation, so the translation loops never branch on the operation.
+# Not compiled with parallel=True: Numba's default threading layer is not fork-safe and hangs
+# the process pool workers, which already parallelize large collections across cores.
+if numba is not None:
+    @numba.njit(cache=True, fastmath=True)
+    def _translate_sub(ring: numpy.ndarray, x_offset: float, y_offset: float) -> None:
+        """Subtract (x_offset, y_offset) from an (N, 2) coordinate array in place."""
+        for i in range(ring.shape[0]):
+            ring[i, 0] -= x_offset
+            ring[i, 1] -= y_offset
+
+    @numba.njit(cache=True, fastmath=True)
+    def _translate_add(ring: numpy.ndarray, x_offset: float, y_offset: float) -> None:
+        """Add (x_offset, y_offset) to an (N, 2) coordinate array in place."""
+        for i in range(ring.shape[0]):
+            ring[i, 0] += x_offset
+            ring[i, 1] += y_offset
+else:
+    def _translate_sub(ring: numpy.ndarray, x_offset: float, y_offset: float) -> None:
+        """Subtract (x_offset, y_offset) from an (N, 2) coordinate array in place."""
+        ring[:, 0] -= x_offset
+        ring[:, 1] -= y_offset
+
+    def _translate_add(ring: numpy.ndarray, x_offset: float, y_offset: float) -> None:
+        """Add (x_offset, y_offset) to an (N, 2) coordinate array in place."""
+        ring[:, 0] += x_offset
+        ring[:, 1] += y_offset
+
+_TRANSLATE_BY_OPERATION = {'localize': _translate_sub, 'restore': _translate_add}
+
+_get_geometry = operator.itemgetter('geometry')
+_get_type_and_coordinates = operator.itemgetter('type', 'coordinates')
     
 class GeoJSONLocalizer:
     def __init__(self, geodata: dict = None):
@@ -17,10 +88,18 @@ class GeoJSONLocalizer:
 
     def _calculate_offset_coords(self) -> tuple[float, float]:
         """Internal method to calculate offset coordinates from the first feature."""
-        for feature in self.geodata['features']:
-            coords = feature['geometry']['coordinates']
-            geom_type = feature['geometry']['type']
+        features = self.geodata['features']
+        if not features:
+            return None
+
+        # Fast path, the first feature usually already is a polygon
+        first_geometry = features[0]['geometry']
+        if first_geometry['type'] == 'Polygon':
+            return first_geometry['coordinates'][0][0]
+        elif first_geometry['type'] == 'MultiPolygon':
+            return first_geometry['coordinates'][0][0][0]
 
+        for geom_type, coords in map(_get_type_and_coordinates, map(_get_geometry, features)):
             if geom_type == 'Polygon':
                 return coords[0][0]
             elif geom_type == 'MultiPolygon':
@@ -34,56 +113,363 @@ class GeoJSONLocalizer:
     def set_custom_offset_coords(self, offset_coords: tuple[float, float]) -> None:
         self.offset_coords = offset_coords
         
-    def _transform_coordinates(self, coords: list, x_offset: float|int, y_offset: float|int, operation: str = 'localize') -> list:
+    def _translate_point(self, point: list, x_offset: float, y_offset: float, translate: Callable) -> list:
+        """Translate a single coordinate pair [x, y], keeping any Z value."""
+        if translate is _translate_add:
+            return [point[0] + x_offset, point[1] + y_offset, *point[2:]]
+        return [point[0] - x_offset, point[1] - y_offset, *point[2:]]
+
+    def _translate_ring(self, ring: list, x_offset: float, y_offset: float, translate: Callable) -> list:
+        """Translate a list of coordinate pairs (LineString, MultiPoint or a polygon ring).
+
+        The output has to be nested lists again, so converting a ring to a NumPy array and back
+        costs more than the arithmetic saves at any ring length. 2D coordinates are translated in a
+        list comprehension, only coordinates with Z values go through the array kernel.
+        """
+        try:
+            if translate is _translate_add:
+                return [[x + x_offset, y + y_offset] for x, y in ring]
+            return [[x - x_offset, y - y_offset] for x, y in ring]
+        except ValueError:
+            ring = numpy.asarray(ring, dtype=numpy.float64)
+            translate(ring, x_offset, y_offset)
+            return ring.tolist()
+
+    def _translate_ring_list(self, rings: list, x_offset: float, y_offset: float, translate: Callable) -> list:
+        """Translate a list of rings (Polygon or MultiLineString)."""
+        return [self._translate_ring(ring, x_offset, y_offset, translate) for ring in rings]
+
+    def _translate_multipolygon(self, polygons: list, x_offset: float, y_offset: float, translate: Callable) -> list:
+        """Translate a list of polygons (MultiPolygon)."""
+        return [self._translate_ring_list(rings, x_offset, y_offset, translate) for rings in polygons]
+
+    def _transform_geometry(self, geometry: dict, x_offset: float, y_offset: float, translate: Callable) -> list:
+        """Transform the coordinates of a GeoJSON geometry, dispatching on its type.
+
+        The nesting depth of the coordinates follows from the geometry type, so no per-level
+        type checks are needed. Unknown types fall back to the generic recursive walk.
+        """
+        geom_type = geometry['type']
+        coords = geometry['coordinates']
+
+        if geom_type == 'Polygon' or geom_type == 'MultiLineString':
+            return self._translate_ring_list(coords, x_offset, y_offset, translate)
+        elif geom_type == 'MultiPolygon':
+            return self._translate_multipolygon(coords, x_offset, y_offset, translate)
+        elif geom_type == 'LineString' or geom_type == 'MultiPoint':
+            return self._translate_ring(coords, x_offset, y_offset, translate)
+        elif geom_type == 'Point':
+            return self._translate_point(coords, x_offset, y_offset, translate)
+        return self._transform_coordinates(coords, x_offset, y_offset, translate)
+
+    def _transform_coordinates(self, coords: list, x_offset: float, y_offset: float, translate: Callable) -> list:
         """Transform coordinates either by localizing (subtracting) or restoring (adding) offset.
         
         Args:
             coords: List of coordinates to transform
             x_offset: X-coordinate offset
             y_offset: Y-coordinate offset
-            operation: Either 'localize' or 'restore'
+            translate: Either _translate_sub (localize) or _translate_add (restore)
         """
         if isinstance(coords[0], (float, int)):
             # A single coordinate pair [x, y]
-            if operation == 'localize':
-                return [coords[0] - x_offset, coords[1] - y_offset]
-            return [coords[0] + x_offset, coords[1] + y_offset]
+            return self._translate_point(coords, x_offset, y_offset, translate)
+        elif isinstance(coords[0][0], (float, int)):
+            # A ring (list of coordinate pairs)
+            return self._translate_ring(coords, x_offset, y_offset, translate)
         else:
             # A nested list (e.g., polygon or multipolygon)
-            return [self._transform_coordinates(subcoords, x_offset, y_offset, operation) for subcoords in coords]
+            return [self._transform_coordinates(subcoords, x_offset, y_offset, translate) for subcoords in coords]
     
-    def _transform_polygons(self, geodata: dict, offset_coords: tuple[float|int, float|int], operation: str = 'localize') -> dict:
+    def _transform_polygons(self, geodata: dict, offset_coords: tuple[float|int, float|int], operation: str = 'localize', threaded: bool = False) -> dict:
         """Transform all polygons in the GeoJSON data.
         
         Args:
             geodata: GeoJSON data to transform
             offset_coords: Tuple of (x_offset, y_offset)
             operation: Either 'localize' or 'restore'
+            threaded: Split large feature collections over a process pool. Opt-in, on platforms
+                      that spawn worker processes the calling script needs an if __name__ == "__main__" guard
         """
-        x_offset, y_offset = offset_coords
+        # A pool with a single worker only adds the process startup and pickling costs
+        if threaded and len(geodata['features']) >= PARALLEL_MIN_FEATURES and (os.cpu_count() or 1) > 1:
+            return self._transform_polygons_parallel(geodata, offset_coords, operation)
+
+        x_offset, y_offset = float(offset_coords[0]), float(offset_coords[1])
+        translate = _TRANSLATE_BY_OPERATION[operation]
 
         for feature in geodata['features']:
-            current_coordinates = feature['geometry']['coordinates']
-            transformed_coordinates = self._transform_coordinates(
-                current_coordinates, x_offset, y_offset, operation
+            transformed_coordinates = self._transform_geometry(
+                feature['geometry'], x_offset, y_offset, translate
             )
             feature['geometry']['coordinates'] = transformed_coordinates
 
         return geodata
 
-    def localize_geojson(self) -> dict:
+    def _transform_polygons_parallel(self, geodata: dict, offset_coords: tuple[float|int, float|int], operation: str = 'localize') -> dict:
+        """Transform features in one chunk per CPU core using a process pool.
+
+        Args:
+            geodata: GeoJSON data to transform
+            offset_coords: Tuple of (x_offset, y_offset)
+            operation: Either 'localize' or 'restore'
+        """
+        features = geodata['features']
+        workers = os.cpu_count() or 1
+        chunk_size = -(-len(features) // workers)
+        chunks = [
+            [feature['geometry'] for feature in features[i:i + chunk_size]]
+            for i in range(0, len(features), chunk_size)
+        ]
+
+        with concurrent.futures.ProcessPoolExecutor(max_workers=workers) as executor:
+            # map() yields chunks in submission order, so features line up with their results
+            results = executor.map(_translate_chunk, chunks, itertools.repeat(offset_coords), itertools.repeat(operation))
+            for feature, transformed_coordinates in zip(features, itertools.chain.from_iterable(results)):
+                feature['geometry']['coordinates'] = transformed_coordinates
+
+        return geodata
+
+    def localize_geojson(self, threaded: bool = False) -> dict:
         """Anonymize the stored GeoJSON data using calculated or set offset coordinates."""
         if not self.geodata or not self.offset_coords:
             raise ValueError("GeoJSON data and offset coordinates must be set before anonymizing")
         
-        return self._transform_polygons(self.geodata, self.offset_coords, 'localize')
+        return self._transform_polygons(self.geodata, self.offset_coords, 'localize', threaded)
 
-    def restore_geojson(self, anonymized_data: dict) -> dict:
+    def restore_geojson(self, anonymized_data: dict, threaded: bool = False) -> dict:
         """Restore anonymized GeoJSON using stored offset coordinates."""
         if not self.offset_coords:
             raise ValueError("Offset coordinates must be set before restoring")
             
-        return self._transform_polygons(anonymized_data, self.offset_coords, 'restore')
+        return self._transform_polygons(anonymized_data, self.offset_coords, 'restore', threaded)
+
+    def _get_rings(self, geometry: dict) -> list:
+        """List the coordinate rings of a geometry in order, a Point being a ring of one."""
+        geom_type = geometry['type']
+        coords = geometry['coordinates']
+
+        if geom_type == 'Polygon' or geom_type == 'MultiLineString':
+            return coords
+        elif geom_type == 'MultiPolygon':
+            return [ring for polygon in coords for ring in polygon]
+        elif geom_type == 'LineString' or geom_type == 'MultiPoint':
+            return [coords]
+        elif geom_type == 'Point':
+            return [[coords]]
+        raise ValueError(f"Unsupported geometry type: {geom_type}")
+
+    def to_soa(self, dtype: numpy.dtype = numpy.float32) -> tuple[numpy.ndarray, numpy.ndarray]:
+        """Pack the coordinates of the stored GeoJSON data into one contiguous structure-of-arrays buffer.
+
+        float32 halves the buffer size but only keeps ~7 significant digits, so pack after
+        localize_geojson() when the coordinates are small local values. Translations can then
+        be applied to the whole buffer at once, e.g. xy -= numpy.array([[dx], [dy]], dtype=xy.dtype).
+        Only 2D coordinates can be packed, data with Z values raises a ValueError.
+
+        Returns:
+            offsets: int32 array of ring start indices into xy, with one extra trailing end index
+            xy: (2, N) array holding all x coordinates in the first row and all y coordinates in the second
+        """
+        if not self.geodata:
+            raise ValueError("GeoJSON data must be set before packing coordinates")
+
+        rings = [
+            numpy.asarray(ring, dtype=dtype)
+            for feature in self.geodata['features']
+            for ring in self._get_rings(feature['geometry'])
+        ]
+        if any(ring.ndim == 2 and ring.shape[1] != 2 for ring in rings):
+            raise ValueError("Only 2D coordinates can be packed, the GeoJSON data contains coordinates with Z values")
+        offsets = numpy.zeros(len(rings) + 1, dtype=numpy.int32)
+        numpy.cumsum([len(ring) for ring in rings], out=offsets[1:])
+        xy = numpy.ascontiguousarray(numpy.concatenate(rings).T) if rings else numpy.empty((2, 0), dtype=dtype)
+
+        return offsets, xy
+
+    def from_soa(self, offsets: numpy.ndarray, xy: numpy.ndarray) -> dict:
+        """Write coordinates packed by to_soa back into the stored GeoJSON data as nested lists."""
+        if not self.geodata:
+            raise ValueError("GeoJSON data must be set before unpacking coordinates")
+
+        rings = (xy[:, start:end].T.tolist() for start, end in zip(offsets[:-1], offsets[1:]))
+        for feature in self.geodata['features']:
+            geometry = feature['geometry']
+            geom_type = geometry['type']
+            coords = geometry['coordinates']
+
+            if geom_type == 'Polygon' or geom_type == 'MultiLineString':
+                geometry['coordinates'] = [next(rings) for _ in coords]
+            elif geom_type == 'MultiPolygon':
+                geometry['coordinates'] = [[next(rings) for _ in polygon] for polygon in coords]
+            elif geom_type == 'LineString' or geom_type == 'MultiPoint':
+                geometry['coordinates'] = next(rings)
+            elif geom_type == 'Point':
+                geometry['coordinates'] = next(rings)[0]
+
+        return self.geodata
+
+    def localize_to_fgb(self, path: str) -> None:
+        """Localize the stored GeoJSON data and write it to a FlatGeobuf file.
+
+        The offset coordinates are stored in the layer DESCRIPTION of the file header,
+        so restore_from_fgb() can restore it without any JSON parsing. The localized coordinates
+        are offsets from an anonymized origin and not in any coordinate reference system, so the
+        file is written without a CRS.
+
+        Args:
+            path: Path of the FlatGeobuf file to write
+        """
+        if geopandas is None or pyogrio is None:
+            raise ImportError("geopandas and pyogrio are required for FlatGeobuf, install them with 'pip install geopandas pyogrio'")
+        if not self.geodata or not self.offset_coords:
+            raise ValueError("GeoJSON data and offset coordinates must be set before anonymizing")
+
+        x_offset, y_offset = float(self.offset_coords[0]), float(self.offset_coords[1])
+        geodataframe = geopandas.GeoDataFrame.from_features(self.geodata['features'], crs=None)
+        geometries = numpy.asarray(geodataframe.geometry.values)
+
+        has_z = shapely.has_z(geometries)[~shapely.is_empty(geometries)]
+        if has_z.any() and not has_z.all():
+            raise ValueError("FlatGeobuf cannot store a mix of 2D and 3D coordinates")
+
+        # Z values are carried along untouched, the kernels only translate the x and y columns
+        coordinates = shapely.get_coordinates(geometries, include_z=bool(has_z.any()))
+        _translate_sub(coordinates, x_offset, y_offset)
+        geodataframe = geodataframe.set_geometry(shapely.set_coordinates(geometries, coordinates))
+
+        # Without a spatial index FlatGeobuf keeps the features in their original order. The missing
+        # CRS is intentional, so pyogrio's warning about it is silenced
+        with warnings.catch_warnings():
+            warnings.filterwarnings('ignore', message="'crs' was not provided", category=UserWarning)
+            pyogrio.write_dataframe(
+                geodataframe,
+                path,
+                driver='FlatGeobuf',
+                layer_options={
+                    'SPATIAL_INDEX': 'NO',
+                    'TITLE': 'geojson_tools localized',
+                    'DESCRIPTION': json.dumps([x_offset, y_offset])
+                }
+            )
+
+    def restore_from_fgb(self, path: str) -> dict:
+        """Restore a FlatGeobuf file written by localize_to_fgb() using the offset stored in its header.
+
+        Args:
+            path: Path of the FlatGeobuf file to read
+
+        Returns:
+            The restored data as a GeoJSON FeatureCollection dict
+        """
+        if geopandas is None or pyogrio is None:
+            raise ImportError("geopandas and pyogrio are required for FlatGeobuf, install them with 'pip install geopandas pyogrio'")
+
+        layer_metadata = pyogrio.read_info(path)['layer_metadata'] or {}
+        if 'DESCRIPTION' not in layer_metadata:
+            raise ValueError("No offset coordinates found in the FlatGeobuf header")
+        self.offset_coords = tuple(json.loads(layer_metadata['DESCRIPTION']))
+
+        geodataframe = pyogrio.read_dataframe(path)
+        geometries = numpy.asarray(geodataframe.geometry.values)
+
+        coordinates = shapely.get_coordinates(geometries, include_z=bool(shapely.has_z(geometries).any()))
+        _translate_add(coordinates, self.offset_coords[0], self.offset_coords[1])
+        geodataframe = geodataframe.set_geometry(shapely.set_coordinates(geometries, coordinates))
+
+        return geodataframe.to_geo_dict(drop_id=True)
+
+
+def _translate_chunk(chunk: list, offset_coords: tuple[float|int, float|int], operation: str) -> list:
+    """Process pool worker, transforms the coordinates of a chunk of feature geometries."""
+    localizer = GeoJSONLocalizer()
+    x_offset, y_offset = float(offset_coords[0]), float(offset_coords[1])
+    translate = _TRANSLATE_BY_OPERATION[operation]
+    return [localizer._transform_geometry(geometry, x_offset, y_offset, translate) for geometry in chunk]
+
+
+def localize_geojson_stream(in_path: str, out_path: str, offset_coords: tuple[float, float] = None) -> tuple[float, float]:
+    """Localize a GeoJSON file feature by feature without loading it fully into memory.
+
+    Top-level members other than the features (type, name, crs, bbox, foreign members) are
+    copied to the output unchanged, after the features array.
+
+    Args:
+        in_path: Path of the GeoJSON FeatureCollection to read
+        out_path: Path to write the localized FeatureCollection to
+        offset_coords: Optional (x_offset, y_offset). If omitted, the first vertex of the
+                       first Polygon/MultiPolygon feature is used, as in GeoJSONLocalizer.
+
+    Returns:
+        The offset coordinates used, needed to restore the data later.
+    """
+    if ijson is None:
+        raise ImportError("ijson is required for streaming, install it with 'pip install ijson'")
+
+    if offset_coords is None:
+        # Short first pass, stops at the first polygon geometry
+        with open(in_path, 'rb') as in_file:
+            for geometry in ijson.items(in_file, 'features.item.geometry', use_float=True):
+                if geometry['type'] == 'Polygon':
+                    offset_coords = geometry['coordinates'][0][0]
+                    break
+                elif geometry['type'] == 'MultiPolygon':
+                    offset_coords = geometry['coordinates'][0][0][0]
+                    break
+        if offset_coords is None:
+            raise ValueError("No Polygon or MultiPolygon features found to calculate offset coordinates from")
+
+    localizer = GeoJSONLocalizer()
+    localizer.set_custom_offset_coords(offset_coords)
+    x_offset, y_offset = float(offset_coords[0]), float(offset_coords[1])
+
+    dumps = orjson.dumps if orjson is not None else lambda obj: json.dumps(obj).encode()
+
+    members = {}
+    member_key = None
+    builder = None
+    written_features = 0
+
+    with open(in_path, 'rb') as in_file, open(out_path, 'wb') as out_file:
+        out_file.write(b'{"features": [')
+        # One pass over the parser events, each feature is built, localized and written as soon
+        # as it ends, the other top-level members are collected on the side
+        for prefix, event, value in ijson.parse(in_file, use_float=True):
+            if builder is None:
+                if prefix == '' and event == 'map_key':
+                    member_key = value if value != 'features' else None
+                    continue
+                if prefix == 'features.item' and event == 'start_map':
+                    builder = ijson.ObjectBuilder()
+                elif member_key is not None and prefix == member_key:
+                    builder = ijson.ObjectBuilder()
+                else:
+                    continue
+
+            builder.event(event, value)
+
+            if prefix == 'features.item' and event == 'end_map':
+                feature = builder.value
+                feature['geometry']['coordinates'] = localizer._transform_geometry(
+                    feature['geometry'], x_offset, y_offset, _translate_sub
+                )
+                if written_features:
+                    out_file.write(b', ')
+                out_file.write(dumps(feature))
+                written_features += 1
+                builder = None
+            elif member_key is not None and prefix == member_key and event not in ('start_map', 'start_array', 'map_key'):
+                # A scalar or the end of the member's object/array
+                members[member_key] = builder.value
+                member_key = None
+                builder = None
+
+        out_file.write(b']')
+        for key, member in members.items():
+            out_file.write(b', ' + dumps(key) + b': ' + dumps(member))
+        out_file.write(b'}')
+
+    return offset_coords
 
 #################
 # Example usage #
@@ -93,14 +479,14 @@ class GeoJSONLocalizer:
 # OUTPUT_FILE_PATH = "sample_output.geojson"
 
 # # Example 1: Initialize with data
-# with open(INPUT_GEODATA_PATH) as file:
-#     geodata = json.load(file)
+# with open(INPUT_GEODATA_PATH, "rb") as file:
+#     geodata = orjson.loads(file.read())
 
 # localizer = GeoJSONLocalizer(geodata)
 # anonymized_data = localizer.localize_geojson()
 
-# with open(OUTPUT_FILE_PATH, "w") as file:
-#     json.dump(anonymized_data, file, indent=4)
+# with open(OUTPUT_FILE_PATH, "wb") as file:
+#     file.write(orjson.dumps(anonymized_data, option=orjson.OPT_INDENT_2))
 
 
 # # Example 2: Initialize empty and set data later
@@ -112,5 +498,15 @@ class GeoJSONLocalizer:
 # # Restore data
 # restored_data = localizer.restore_geojson(anonymized_data)
 
-# with open(OUTPUT_FILE_PATH, "w") as file:
-#     json.dump(anonymized_data, file, indent=4)
\ No newline at end of file
+# with open(OUTPUT_FILE_PATH, "wb") as file:
+#     file.write(orjson.dumps(anonymized_data, option=orjson.OPT_INDENT_2))
+
+
+# # Example 3: Localize a large file without loading it into memory (requires ijson)
+# offset_coords = localize_geojson_stream(INPUT_GEODATA_PATH, OUTPUT_FILE_PATH)
+
+
+# # Example 4: Round-trip through a FlatGeobuf file instead of JSON (requires geopandas and pyogrio)
+# localizer = GeoJSONLocalizer(geodata)
+# localizer.localize_to_fgb("sample_output.fgb")
+# restored_data = GeoJSONLocalizer().restore_from_fgb("sample_output.fgb")
\ No newline at end of file
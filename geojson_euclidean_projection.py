@@ -1,106 +1,417 @@
-# pip install matplotlib shapely pyproj geojson
+# pip install matplotlib shapely pyproj orjson
+import concurrent.futures
+import functools
 import json
+import os
 
+import matplotlib.collections
 import matplotlib.pyplot
+import numpy
 import shapely
 import pyproj
-import geojson
+
+try:
+    import ijson
+except ImportError:
+    ijson = None
+
+try:
+    import numba
+except ImportError:
+    numba = None
+
+try:
+    import orjson
+except ImportError:
+    orjson = None
+
+# Below this many coordinates the thread pool overhead outweighs the parallel speedup
+THREADED_MIN_COORDINATES = 100000
+# Below this many coordinates the NumPy affine of transform_to_localized_coordinate_system is as
+# fast as the compiled Numba kernel
+NUMBA_MIN_COORDINATES = 50000
+
+
+if numba is not None:
+    # Only used by the step-wise transform_to_localized_coordinate_system, project() rotates and
+    # scales inside its PROJ pipeline. Spread over cores with a thread pool instead of parallel=True,
+    # Numba's parallel threading layer is not fork-safe and hangs the process pool that
+    # _project_tiles_to_UTM forks afterwards
+    @numba.njit(nogil=True, fastmath=True, cache=True)
+    def _apply_affine(xy: numpy.ndarray, cx: float, cy: float, m00: float, m01: float, m10: float, m11: float) -> None:
+        """Center a (2, N) coordinate buffer on (cx, cy) and apply the 2x2 matrix in place."""
+        for i in range(xy.shape[1]):
+            x = xy[0, i] - cx
+            y = xy[1, i] - cy
+            xy[0, i] = m00 * x + m01 * y
+            xy[1, i] = m10 * x + m11 * y
+
+
+@functools.lru_cache(maxsize=64)
+def _utm_transformer(utm_zone: int) -> pyproj.Transformer:
+    """Create a transformer from EPSG:4326 to the given UTM zone, cached per zone."""
+    UTM_based_localized_coordinate_system = pyproj.CRS.from_user_input(
+        f'+proj=utm +zone={utm_zone} +datum=WGS84 +units=m +no_defs'
+    )
+    # Create a transformer from EPSG:4326 to the chosen UTM CRS (Coordinate Reference System).
+    return pyproj.Transformer.from_crs("EPSG:4326", UTM_based_localized_coordinate_system, always_xy=True)
+
+
+@functools.lru_cache(maxsize=64)
+def _utm_affine_transformer(utm_zone: int, rotate_deg: float, scale_factor: float) -> pyproj.Transformer:
+    """Create a single PROJ pipeline projecting EPSG:4326 to the given UTM zone, then rotating and scaling."""
+    pipeline = f'+proj=pipeline +step +proj=utm +zone={utm_zone} +ellps=WGS84'
+
+    # With the default rotation and scale the affine step would be an identity, so it is left out
+    if rotate_deg != 0 or scale_factor != 1.0:
+        theta = numpy.deg2rad(rotate_deg)
+        # Python floats, their repr is the shortest string that round-trips exactly
+        cos_theta = float(scale_factor * numpy.cos(theta))
+        sin_theta = float(scale_factor * numpy.sin(theta))
+        pipeline += f' +step +proj=affine +s11={cos_theta!r} +s12={-sin_theta!r} +s21={sin_theta!r} +s22={cos_theta!r}'
+
+    return pyproj.Transformer.from_pipeline(pipeline)
+
+
+def _flatten_polygons(features: list) -> tuple[numpy.ndarray, numpy.ndarray, numpy.ndarray]:
+    """Flatten Polygon features into one (2, N) coordinate buffer with ring and polygon offsets.
+
+    The coordinates of ring i are xy[:, ring_offsets[i]:ring_offsets[i + 1]] and polygon j
+    consists of rings polygon_offsets[j] up to polygon_offsets[j + 1].
+    """
+    polygons = [feature["geometry"]["coordinates"] for feature in features]
+    rings = [ring for polygon in polygons for ring in polygon]
+
+    ring_offsets = numpy.zeros(len(rings) + 1, dtype=numpy.int32)
+    numpy.cumsum(numpy.fromiter((len(ring) for ring in rings), dtype=numpy.int32, count=len(rings)), out=ring_offsets[1:])
+    polygon_offsets = numpy.zeros(len(polygons) + 1, dtype=numpy.int32)
+    numpy.cumsum(numpy.fromiter((len(polygon) for polygon in polygons), dtype=numpy.int32, count=len(polygons)), out=polygon_offsets[1:])
+
+    if not rings:
+        return numpy.empty((2, 0)), ring_offsets, polygon_offsets
+    xy = numpy.concatenate([numpy.asarray(ring, dtype=numpy.float64)[:, :2] for ring in rings])
+    return numpy.ascontiguousarray(xy.T), ring_offsets, polygon_offsets
+
+
+def _build_polygons(xy: numpy.ndarray, ring_offsets: numpy.ndarray, polygon_offsets: numpy.ndarray) -> numpy.ndarray:
+    """Build Shapely polygons from a (2, N) coordinate buffer and its offsets with two vectorized calls."""
+    ring_index = numpy.repeat(numpy.arange(len(ring_offsets) - 1), numpy.diff(ring_offsets))
+    polygon_index = numpy.repeat(numpy.arange(len(polygon_offsets) - 1), numpy.diff(polygon_offsets))
+
+    # The first ring of every polygon index becomes the shell and the rest its holes, polygons
+    # without any rings are left as the empty polygons the output is prefilled with
+    polygons = numpy.full(len(polygon_offsets) - 1, shapely.Polygon(), dtype=object)
+    rings = shapely.linearrings(xy.T, indices=ring_index)
+    return shapely.polygons(rings, indices=polygon_index, out=polygons)
+
+
+def _map_chunks(function, xy: numpy.ndarray) -> None:
+    """Apply an in place function to a (2, N) buffer split into one column chunk per core, in a thread pool."""
+    chunks = numpy.array_split(xy, os.cpu_count() or 1, axis=1)
+    with concurrent.futures.ThreadPoolExecutor(max_workers=len(chunks)) as executor:
+        list(executor.map(function, chunks))
+
+
+def _project_tile_to_UTM(xy: numpy.ndarray, utm_zone: int, rotate_deg: float, scale_factor: float) -> numpy.ndarray:
+    """Process pool worker, projects the (2, N) coordinate buffer of one tile to rotated and scaled UTM."""
+    # Bypasses the cache so every worker builds its own transformer instead of using a PROJ
+    # object inherited from the parent process
+    transformation_to_UTM = _utm_affine_transformer.__wrapped__(utm_zone, rotate_deg, scale_factor).transform
+    transformation_to_UTM(xy[0], xy[1], inplace=True)
+    return xy
 
     
 class GeoJSONProjector:
-    def __init__(self, geodata: dict, rotate_deg: int = 0, scale_factor: float = 1.0):
+    def __init__(self, geodata: dict, rotate_deg: int = 0, scale_factor: float = 1.0, dtype: type = numpy.float64):
         self.geodata = geodata
         self.source_polygons = self._get_source_polygons()
+        self._source_xy, self._ring_offsets, self._polygon_offsets = _flatten_polygons(self.source_polygons)
+        self._source_properties = self._parse_source_polygons()
         self.projected_polygons = None
 
         self.rotate_deg = rotate_deg
         self.scale_factor = scale_factor
 
+        # Precision of the localized coordinates, the UTM projection itself always runs in float64.
+        # Centered coordinates of a city sized area keep about 1 cm precision in float32
+        self.dtype = numpy.dtype(dtype)
+        if self.dtype not in (numpy.float32, numpy.float64):
+            raise ValueError("dtype must be numpy.float32 or numpy.float64")
+
+    @classmethod
+    def from_geojson_file(cls, path: str, rotate_deg: int = 0, scale_factor: float = 1.0, dtype: type = numpy.float64) -> "GeoJSONProjector":
+        """Create a projector from a GeoJSON file stream-parsed one feature at a time (requires ijson).
+
+        Features other than Polygons are dropped as they arrive and the rings of the kept ones are
+        converted to (N, 2) NumPy arrays right away, so the whole file is never held as Python objects.
+        """
+        if ijson is None:
+            raise ImportError("ijson is required for streaming, install it with 'pip install ijson'")
+
+        polygon_features = []
+        with open(path, "rb") as file:
+            for feature in ijson.items(file, "features.item", use_float=True):
+                if feature["geometry"]["type"] != "Polygon":
+                    continue
+                feature["geometry"]["coordinates"] = [
+                    numpy.asarray(ring, dtype=numpy.float64) for ring in feature["geometry"]["coordinates"]
+                ]
+                polygon_features.append(feature)
+
+        geodata = {"type": "FeatureCollection", "features": polygon_features}
+        return cls(geodata, rotate_deg=rotate_deg, scale_factor=scale_factor, dtype=dtype)
+
     def _get_source_polygons(self) -> list:
         return [feature for feature in self.geodata["features"] if feature["geometry"]["type"] == "Polygon"]
+
+    def _parse_source_polygons(self) -> list:
+        # The geometries themselves are only kept as the flattened coordinate buffer, Shapely
+        # polygons are built from it after projecting
+        return [feature["properties"] for feature in self.source_polygons]
     
     def set_new_geodata(self, geodata: dict) -> None:
         """Set new GeoJSON data."""
         self.geodata = geodata
         self.source_polygons = self._get_source_polygons()
+        self._source_xy, self._ring_offsets, self._polygon_offsets = _flatten_polygons(self.source_polygons)
+        self._source_properties = self._parse_source_polygons()
         self.projected_polygons = None
 
-    def _get_transformation_to_UTM(self):
+    @property
+    def projected_polygons(self) -> list:
+        """Projected polygons with Shapely geometries, built from the projected coordinate buffer on first access."""
+        if self._projected_polygons is None and self._projected_xy is not None:
+            geometries = _build_polygons(self._projected_xy, self._ring_offsets, self._polygon_offsets)
+            self._built_geometries = geometries
+            self._projected_polygons = [
+                {
+                    "geometry": geometry,
+                    "properties": properties
+                }
+                for geometry, properties in zip(geometries, self._source_properties)
+            ]
+        return self._projected_polygons
+
+    @projected_polygons.setter
+    def projected_polygons(self, projected_polygons: list) -> None:
+        self._projected_polygons = projected_polygons
+        self._projected_xy = None
+
+    def _projected_polygons_changed(self) -> bool:
+        # Shapely geometries are immutable, so the list handed out by projected_polygons can only
+        # change by replacing features, geometries or properties, which the identity checks catch
+        polygons = self._projected_polygons
+        if polygons is None:
+            return False
+        if len(polygons) != len(self._built_geometries):
+            return True
+        return any(
+            feature["geometry"] is not geometry or feature["properties"] is not properties
+            for feature, geometry, properties in zip(polygons, self._built_geometries, self._source_properties)
+        )
+
+    def _get_UTM_zone(self) -> int:
         # What is UTM? - https://en.wikipedia.org/wiki/Universal_Transverse_Mercator_coordinate_system
         if not self.source_polygons:
             raise ValueError("No polygon features available for transformation")
 
-        # Compute a custom localized UTM projection based on average centroid
-        all_centroids = [shapely.geometry.shape(feature["geometry"]).centroid for feature in self.source_polygons]
-        average_longitude = sum(c.x for c in all_centroids) / len(all_centroids)
+        # Compute a custom localized UTM projection based on the average polygon longitude. The zone
+        # only needs an approximate longitude, so the first exterior vertex of every non-empty polygon
+        # is read from the source buffer instead of computing per-polygon centroids
+        has_rings = self._polygon_offsets[1:] > self._polygon_offsets[:-1]
+        first_vertices = self._ring_offsets[self._polygon_offsets[:-1][has_rings]]
+        average_longitude = self._source_xy[0, first_vertices].mean()
 
-        UTM_based_localized_coordinate_system = pyproj.CRS.from_user_input(
-            f'+proj=utm +zone={(int((average_longitude + 180) / 6) + 1)} +datum=WGS84 +units=m +no_defs'
-        )
-        # Create a transformer from EPSG:4326 to the chosen UTM CRS (Coordinate Reference System).
-        raw_transformation_to_UTM = pyproj.Transformer.from_crs("EPSG:4326", UTM_based_localized_coordinate_system, always_xy=True).transform
-        lambda_transformation_to_UTM = lambda x, y: raw_transformation_to_UTM(x, y)
+        return int((average_longitude + 180) / 6) + 1
 
-        return lambda_transformation_to_UTM
+    def _get_transformation_to_UTM(self, rotate_and_scale: bool = False):
+        if rotate_and_scale:
+            return _utm_affine_transformer(self._get_UTM_zone(), self.rotate_deg, self.scale_factor).transform
+        return _utm_transformer(self._get_UTM_zone()).transform
     
-    def project_to_UTM(self) -> list:
+    def _get_coordinate_buffer(self, geometries: numpy.ndarray) -> numpy.ndarray:
+        # (2, N) layout, so the x and y rows are contiguous buffers pyproj can transform in place
+        return numpy.ascontiguousarray(shapely.get_coordinates(geometries).T)
+
+    def _project_coordinates_to_UTM(self, xy: numpy.ndarray, threaded: bool = True, rotate_and_scale: bool = False) -> None:
+        """Project a (2, N) longitude/latitude buffer to UTM in place with a single transform call.
+
+        With rotate_and_scale=True the rotation and scaling run in the same PROJ pipeline call.
+        """
+        transformation_to_UTM = self._get_transformation_to_UTM(rotate_and_scale)
+
+        def project_chunk(chunk: numpy.ndarray) -> None:
+            transformation_to_UTM(chunk[0], chunk[1], inplace=True)
+
+        if threaded and xy.shape[1] >= THREADED_MIN_COORDINATES:
+            # PROJ releases the GIL and pyproj transformers are thread-safe, so the chunks run concurrently
+            _map_chunks(project_chunk, xy)
+        else:
+            project_chunk(xy)
+
+    def project_to_UTM(self, threaded: bool = True) -> list:
         if not self.source_polygons:
             raise ValueError("No polygon features available for transformation")
     
-        transformation_to_UTM = self._get_transformation_to_UTM()
+        # All polygons are projected as one coordinate buffer instead of one transform call per polygon
+        xy = self._source_xy.copy()
+        self._project_coordinates_to_UTM(xy, threaded)
+        geometries = _build_polygons(xy, self._ring_offsets, self._polygon_offsets)
+
         projected_polygons = [
             {                               
-                "geometry": shapely.transform(
-                    transformation=transformation_to_UTM,
-                    geometry=shapely.geometry.shape(polygon["geometry"]), 
-                    interleaved=False # if set to false, then transformation function will be given separate x and y coordinate arrays
-                ),
-                "properties": polygon["properties"]
+                "geometry": geometry,
+                "properties": properties
             }
-            for polygon in self.source_polygons
+            for geometry, properties in zip(geometries, self._source_properties)
         ]
         return projected_polygons
     
-    def _get_centroid_coordinates(self, polygons: list) -> tuple:
-        # Compute global centroid to center everything
-        all_coordinates = [
-            coordinates 
-            for polygon in polygons 
-            for coordinates in polygon["geometry"].exterior.coords
-        ]
-        x_coordinates, y_coordinates = zip(*all_coordinates)
-        center_x = sum(x_coordinates) / len(x_coordinates)
-        center_y = sum(y_coordinates) / len(y_coordinates)
-        return center_x, center_y
-    
-    def transform_to_localized_coordinate_system(self, UTM_projected_polygons: list):
-        transformed_polygons = []
+    def _localize_coordinate_buffer(self, xy: numpy.ndarray, threaded: bool = True) -> numpy.ndarray:
+        """Center, rotate and scale a (2, N) UTM coordinate buffer with one fused affine transform.
 
-        center_x, center_y = self._get_centroid_coordinates(UTM_projected_polygons)
-        for polygon in UTM_projected_polygons:
-            geometry = polygon["geometry"]
+        Used by the step-wise transform_to_localized_coordinate_system, project() rotates and scales
+        inside its PROJ pipeline and only centers afterwards. The float64 buffer is transformed in
+        place and returned, with dtype float32 the centered coordinates are cast and the returned
+        float32 buffer is transformed instead.
+        """
+        # Compute global centroid to center everything, over all rings including holes
+        center = xy.mean(axis=1)
 
-            geometry = shapely.affinity.translate(geometry, xoff=-center_x, yoff=-center_y)
-            if self.rotate_deg:
-                geometry = shapely.affinity.rotate(geometry, self.rotate_deg, origin=(0, 0))
-            if self.scale_factor != 1.0:
-                geometry = shapely.affinity.scale(geometry, xfact=self.scale_factor, yfact=self.scale_factor, origin=(0, 0))
+        if self.rotate_deg == 0 and self.scale_factor == 1.0:
+            # Default rotation and scale, centering is all there is to do
+            xy -= center[:, None]
+            return xy.astype(self.dtype, copy=False)
 
-            transformed_polygons.append(
-                {
-                    "geometry": geometry,
-                    "properties": polygon["properties"]
-                }
-            )
-        
+        # Translation to the center, rotation around the origin and scaling fused into
+        # s * R @ (p - center), so every coordinate is only traversed once
+        theta = numpy.deg2rad(self.rotate_deg)
+        linear = self.scale_factor * numpy.array([
+            [numpy.cos(theta), -numpy.sin(theta)],
+            [numpy.sin(theta), numpy.cos(theta)]
+        ])
+
+        if self.dtype == numpy.float32:
+            # Centered in float64 first so only the small offsets from the center are rounded,
+            # the rotation and scaling then run on half the memory
+            xy -= center[:, None]
+            xy = xy.astype(numpy.float32)
+            center = numpy.zeros(2)
+            linear = linear.astype(numpy.float32)
+
+        if numba is not None and xy.shape[1] >= NUMBA_MIN_COORDINATES:
+            # Large enough for the compiled kernel to pay off
+            def localize_chunk(chunk: numpy.ndarray) -> None:
+                _apply_affine(chunk, center[0], center[1], linear[0, 0], linear[0, 1], linear[1, 0], linear[1, 1])
+        else:
+            translation = (-linear @ center)[:, None]
+
+            # The result lands back in the projected buffer. out aliases the input, so NumPy still
+            # copies the chunk into an internal temporary for the matmul
+            def localize_chunk(chunk: numpy.ndarray) -> None:
+                numpy.matmul(linear, chunk, out=chunk)
+                chunk += translation
+
+        if threaded and xy.shape[1] >= THREADED_MIN_COORDINATES:
+            # Both the Numba kernel and NumPy release the GIL, so the chunks run concurrently
+            _map_chunks(localize_chunk, xy)
+        else:
+            localize_chunk(xy)
+        return xy
+
+    def transform_to_localized_coordinate_system(self, UTM_projected_polygons: list):
+        geometries = numpy.array([polygon["geometry"] for polygon in UTM_projected_polygons], dtype=object)
+        xy = self._get_coordinate_buffer(geometries)
+        xy = self._localize_coordinate_buffer(xy)
+        geometries = shapely.set_coordinates(geometries, xy.T)
+
+        transformed_polygons = [
+            {
+                "geometry": geometry,
+                "properties": polygon["properties"]
+            }
+            for geometry, polygon in zip(geometries, UTM_projected_polygons)
+        ]
         return transformed_polygons
 
-    def project(self) -> list:
-        """Project the GeoJSON polygons to Euclidean space."""
-        UTM_projected_polygons = self.project_to_UTM()
-        transformed_polygons = self.transform_to_localized_coordinate_system(UTM_projected_polygons)
+    def _project_tiles_to_UTM(self, xy: numpy.ndarray, num_divisions: int, threaded: bool = True) -> None:
+        """Project the coordinate buffer to rotated and scaled UTM in place, one process per tile of a num_divisions x num_divisions grid."""
+        # Worker processes only pay off with more than one core to run them on
+        if (os.cpu_count() or 1) == 1:
+            self._project_coordinates_to_UTM(xy, threaded, rotate_and_scale=True)
+            return
+
+        # Every polygon goes to the tile containing the center of its bounding box. Bounds are only
+        # computed for polygons with vertices, empty polygons have no coordinates to send anywhere
+        polygon_starts = self._ring_offsets[self._polygon_offsets]
+        has_vertices = polygon_starts[:-1] < polygon_starts[1:]
+        if not has_vertices.any():
+            return
+        min_xy = numpy.minimum.reduceat(xy, polygon_starts[:-1][has_vertices], axis=1)
+        max_xy = numpy.maximum.reduceat(xy, polygon_starts[:-1][has_vertices], axis=1)
+        min_x, min_y = min_xy.min(axis=1)
+        max_x, max_y = max_xy.max(axis=1)
+        tile_x = ((min_xy[0] + max_xy[0]) / 2 - min_x) / ((max_x - min_x) or 1.0) * num_divisions
+        tile_y = ((min_xy[1] + max_xy[1]) / 2 - min_y) / ((max_y - min_y) or 1.0) * num_divisions
+        polygon_tiles = numpy.zeros(len(has_vertices), dtype=int)
+        polygon_tiles[has_vertices] = (
+            numpy.clip(tile_y.astype(int), 0, num_divisions - 1) * num_divisions
+            + numpy.clip(tile_x.astype(int), 0, num_divisions - 1)
+        )
+        coordinate_tiles = numpy.repeat(polygon_tiles, numpy.diff(polygon_starts))
+
+        # Sort the coordinates by tile once, every tile is then a contiguous column range
+        order = numpy.argsort(coordinate_tiles, kind="stable")
+        tile_counts = numpy.bincount(coordinate_tiles)
+        tile_counts = tile_counts[tile_counts > 0]
+        if len(tile_counts) == 1:
+            self._project_coordinates_to_UTM(xy, threaded, rotate_and_scale=True)
+            return
+        tile_offsets = numpy.concatenate(([0], numpy.cumsum(tile_counts))).tolist()
+
+        utm_zone = self._get_UTM_zone()
+        tiled_xy = xy[:, order]
+        with concurrent.futures.ProcessPoolExecutor(max_workers=min(len(tile_counts), os.cpu_count())) as executor:
+            tile_futures = [
+                executor.submit(
+                    _project_tile_to_UTM, numpy.ascontiguousarray(tiled_xy[:, start:end]), utm_zone, self.rotate_deg, self.scale_factor
+                )
+                for start, end in zip(tile_offsets[:-1], tile_offsets[1:])
+            ]
+            for start, end, tile_future in zip(tile_offsets[:-1], tile_offsets[1:], tile_futures):
+                tiled_xy[:, start:end] = tile_future.result()
+        xy[:, order] = tiled_xy
+
+    def project_vectorized(self, threaded: bool = True, num_divisions: int = 1) -> list:
+        """Project the GeoJSON polygons to Euclidean space in a single pass over one coordinate buffer.
 
-        self.projected_polygons = transformed_polygons
+        Gives the same result as running project_to_UTM and transform_to_localized_coordinate_system
+        one after the other, working only on the flat coordinate buffer parsed from the GeoJSON. The
+        UTM projection, rotation and scaling run as one PROJ pipeline call.
+        Shapely geometries are only built once projected_polygons is accessed. With num_divisions > 1
+        the polygons are split into a num_divisions x num_divisions grid of tiles that are projected
+        in separate processes.
+        """
+        if not self.source_polygons:
+            raise ValueError("No polygon features available for transformation")
+
+        xy = self._source_xy.copy()
+        if num_divisions > 1:
+            self._project_tiles_to_UTM(xy, num_divisions, threaded)
+        else:
+            self._project_coordinates_to_UTM(xy, threaded, rotate_and_scale=True)
+
+        # Rotation and scaling are linear, so centering the rotated and scaled coordinates on
+        # their mean equals s * R @ (p - center) and no separate affine pass is needed
+        xy -= xy.mean(axis=1)[:, None]
+        xy = xy.astype(self.dtype, copy=False)
+        self.projected_polygons = None
+        self._projected_xy = xy
+        return self.projected_polygons
+
+    def project(self, threaded: bool = True, num_divisions: int = 1) -> list:
+        """Project the GeoJSON polygons to Euclidean space."""
+        transformed_polygons = self.project_vectorized(threaded, num_divisions)
 
         # TODO: return success/failure status instead
         return transformed_polygons
@@ -112,86 +423,127 @@ class GeoJSONProjector:
         if ax is None:
             fig, ax = matplotlib.pyplot.subplots()
 
-        for polygon in self.projected_polygons:
-            geometry = polygon["geometry"]
-            name = polygon["properties"].get("Name", "")
-
-            if geometry.geom_type == "Polygon":
-                x, y = geometry.exterior.xy
-                ax.plot(x, y)
-                centroid = geometry.centroid
-                if name:
-                    ax.annotate(name,
-                                xy=(centroid.x, centroid.y),
-                                ha="center",
-                                va="center",
-                                bbox=dict(facecolor="white",
-                                          alpha=0.5,
-                                          edgecolor="none",
-                                          pad=0.3))
-                    
-            elif geometry.geom_type == "MultiPolygon":
-                for part in geometry.geoms:
-                    x, y = part.exterior.xy
-                    ax.plot(x, y)
-                    centroid = part.centroid
-                    if name:
-                        ax.annotate(name,
-                                    xy=(centroid.x, centroid.y),
-                                    ha="center",
-                                    va="center",
-                                    bbox=dict(facecolor="white",
-                                              alpha=0.5,
-                                              edgecolor="none",
-                                              pad=0.3))
+        # All rings are drawn as a single LineCollection artist instead of one ax.plot call per ring,
+        # MultiPolygons are exploded into their parts and the rings read with vectorized Shapely calls
+        geometries = numpy.array([polygon["geometry"] for polygon in self.projected_polygons], dtype=object)
+        names = numpy.array([polygon["properties"].get("Name", "") for polygon in self.projected_polygons], dtype=object)
+        is_polygonal = numpy.isin(shapely.get_type_id(geometries), [shapely.GeometryType.POLYGON, shapely.GeometryType.MULTIPOLYGON])
+        parts, part_index = shapely.get_parts(geometries[is_polygonal], return_index=True)
+        part_names = names[is_polygonal][part_index]
+
+        exteriors = shapely.get_exterior_ring(parts)
+        ring_ends = numpy.cumsum(shapely.get_num_coordinates(exteriors))
+        rings = numpy.split(shapely.get_coordinates(exteriors), ring_ends[:-1]) if len(parts) else []
+
+        colors = matplotlib.rcParams["axes.prop_cycle"].by_key()["color"]
+        ax.add_collection(matplotlib.collections.LineCollection(
+            rings,
+            colors=[colors[i % len(colors)] for i in range(len(rings))]
+        ))
+        ax.autoscale_view()
+
+        # Empty parts have no centroid coordinates to place a label at
+        is_named = (part_names != "") & ~shapely.is_empty(parts)
+        for name, (x, y) in zip(part_names[is_named], shapely.get_coordinates(shapely.centroid(parts[is_named]))):
+            ax.annotate(name,
+                        xy=(x, y),
+                        ha="center",
+                        va="center",
+                        bbox=dict(facecolor="white",
+                                  alpha=0.5,
+                                  edgecolor="none",
+                                  pad=0.3))
 
         ax.set_aspect("equal")
         ax.grid(True)
         ax.set_title("Euclidean projection of GeoJSON Polygons, scale in meters")
         matplotlib.pyplot.show()
 
-    def cast_to_geojson(self) -> geojson.FeatureCollection:
-        """Convert projected polygons to GeoJSON format."""
-        if self.projected_polygons is None:
-            raise ValueError("No projected polygons available. Call project() first.")
+    def cast_to_geojson(self, numpy_coordinates: bool = False) -> dict:
+        """Convert projected polygons to GeoJSON format.
+
+        With numpy_coordinates=True the rings of polygons projected by project() are (N, 2) NumPy
+        views into the projected buffer instead of lists, for orjson's OPT_SERIALIZE_NUMPY. Once
+        features of the list returned by project() are replaced, that list is serialized instead.
+        """
+        if self._projected_xy is not None and not self._projected_polygons_changed():
+            # Convert the whole projected buffer at once and slice rings and polygons out of it
+            # by offset, no Shapely round trip. The (N, 2) copy keeps every ring view C-contiguous
+            if numpy_coordinates:
+                all_coordinates = numpy.ascontiguousarray(self._projected_xy.T)
+            else:
+                all_coordinates = self._projected_xy.T.tolist()
+            ring_offsets = self._ring_offsets.tolist()
+            polygon_offsets = self._polygon_offsets.tolist()
+            rings = [all_coordinates[start:end] for start, end in zip(ring_offsets[:-1], ring_offsets[1:])]
+            polygons = [rings[start:end] for start, end in zip(polygon_offsets[:-1], polygon_offsets[1:])]
+            geometries = [{"type": "Polygon", "coordinates": coordinates} for coordinates in polygons]
+            properties = self._source_properties
+        else:
+            if self.projected_polygons is None:
+                raise ValueError("No projected polygons available. Call project() first.")
+
+            # Externally assigned geometries are serialized with one vectorized to_geojson call, keeping
+            # their own type, e.g. MultiPolygons
+            geometries = numpy.array([feature["geometry"] for feature in self.projected_polygons], dtype=object)
+            geometries = [json.loads(geometry) for geometry in shapely.to_geojson(geometries)]
+            properties = [feature["properties"] for feature in self.projected_polygons]
     
-        return geojson.FeatureCollection(
-            [
-                geojson.Feature(
-                    properties=feature["properties"],
-                    geometry=shapely.geometry.mapping(feature["geometry"])
-                ) for feature in self.projected_polygons
+        # Built as plain dicts that orjson or json serialize as is
+        return {
+            "type": "FeatureCollection",
+            "features": [
+                {
+                    "type": "Feature",
+                    "properties": feature_properties,
+                    "geometry": geometry
+                } for feature_properties, geometry in zip(properties, geometries)
             ]
-        )
+        }
+
+    def write_geojson(self, path: str) -> None:
+        """Write the projected polygons to a GeoJSON file, encoded with orjson when it is installed."""
+        if orjson is not None:
+            # orjson encodes the coordinates straight from the NumPy buffer, no Python floats are created
+            output_geojson = self.cast_to_geojson(numpy_coordinates=True)
+            with open(path, "wb") as file:
+                file.write(orjson.dumps(output_geojson, option=orjson.OPT_SERIALIZE_NUMPY | orjson.OPT_INDENT_2))
+        else:
+            with open(path, "w") as file:
+                json.dump(self.cast_to_geojson(), file, indent=4)
     
 #################
 # Example usage #
 #################
 
-INPUT_GEODATA_PATH = "sample_input.geojson"
-OUTPUT_FILE_PATH = "sample_output.geojson"
-
-with open(INPUT_GEODATA_PATH) as file:
-    geodata = json.load(file)
-
-# Initialize with data
-projector = GeoJSONProjector(
-    geodata=geodata,
-    rotate_deg=45,
-    scale_factor=1.2
-)
-
-# Project and plot
-projected_polygons = projector.project()
-projector.plot()
-
-# # Get GeoJSON output
-# output_geojson = projector.cast_to_geojson()
-# with open(OUTPUT_FILE_PATH, "w") as file:
-#     json.dump(output_geojson, file, indent=4)
-
-# # Or initialize empty and set data later
-# projector = GeoJSONProjector(rotate_deg=45, scale_factor=1.2)
-# projector.set_new_geodata(geodata)
-# projector.project()
-# projector.plot()
\ No newline at end of file
+if __name__ == "__main__":
+    INPUT_GEODATA_PATH = "sample_input.geojson"
+    OUTPUT_FILE_PATH = "sample_output.geojson"
+
+    with open(INPUT_GEODATA_PATH, "rb") as file:
+        geodata = orjson.loads(file.read())
+
+    # Initialize with data
+    projector = GeoJSONProjector(
+        geodata=geodata,
+        rotate_deg=45,
+        scale_factor=1.2
+    )
+
+    # Project and plot
+    projected_polygons = projector.project()
+    projector.plot()
+
+    # # Write GeoJSON output
+    # projector.write_geojson(OUTPUT_FILE_PATH)
+    # # or get it as a dict
+    # output_geojson = projector.cast_to_geojson()
+
+    # # Or stream-parse a large file, keeping only its Polygon features (requires ijson)
+    # projector = GeoJSONProjector.from_geojson_file(INPUT_GEODATA_PATH, rotate_deg=45, scale_factor=1.2)
+
+    # # Or initialize empty and set data later
+    # projector = GeoJSONProjector(rotate_deg=45, scale_factor=1.2)
+    # projector.set_new_geodata(geodata)
+    # projector.project()
+    # projector.plot()
\ No newline at end of file